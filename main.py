@@ -1,22 +1,62 @@
 from fastapi import FastAPI, UploadFile, File, Form, HTTPException, BackgroundTasks
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, StreamingResponse, ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import List, Optional, Dict
+from dataclasses import dataclass
+from contextlib import aclosing, asynccontextmanager
 import ollama
+import redis.asyncio as aioredis
+from redis.exceptions import WatchError
 import tempfile
 import os
 import fitz  # PyMuPDF
 import pdfplumber
-import base64
-from io import BytesIO
 from PIL import Image
 import asyncio
 import uuid
 import time
-
-app = FastAPI(title="PDF Analysis API", version="1.0.0", description="Complete PDF analysis with multimodal AI")
+import hashlib
+import re
+import json
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+
+# 정적 테스트 페이지 - 시작 시 한 번만 읽어 메모리에서 응답
+HTML_PAGES = {
+    "test": "static/test.html",
+    "pdf-test": "static/pdf-test.html",
+    "api-docs": "static/api-docs.html",
+}
+
+
+def new_page_pool() -> ProcessPoolExecutor:
+    # 페이지 단위 PDF 파싱용 프로세스 풀 (GIL 없이 페이지를 병렬 처리)
+    # 스레드가 실행 중인 프로세스를 fork하면 교착될 수 있으므로 forkserver(없으면 spawn)로 워커 생성
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return ProcessPoolExecutor(max_workers=PDF_PAGE_WORKERS, mp_context=multiprocessing.get_context(method))
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # asyncio.to_thread로 넘기는 PDF 파싱 작업용 스레드 풀
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=os.cpu_count()))
+    app.state.pool = new_page_pool()
+    app.state.html = {}
+    for name, path in HTML_PAGES.items():
+        with open(path, "rb") as f:
+            app.state.html[name] = f.read()
+    yield
+    app.state.pool.shutdown(cancel_futures=True)
+    await task_store.close()
+
+
+# 대용량 text_content/analysis 응답을 orjson으로 직렬화
+app = FastAPI(title="PDF Analysis API", version="1.0.0", description="Complete PDF analysis with multimodal AI",
+              lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # CORS 설정 - Next.js와 모든 Origin 허용
 app.add_middleware(
@@ -29,8 +69,46 @@ app.add_middleware(
 
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
-# 진행 중인 작업 추적
-processing_tasks: Dict[str, Dict] = {}
+
+# 텍스트/테이블 추출 엔진 ("pymupdf" 기본, pdfplumber 레이아웃이 필요하면 "pdfplumber")
+PDF_TEXT_ENGINE = os.getenv("PDF_TEXT_ENGINE", "pymupdf")
+
+# Ollama에 그대로 전달할 수 있는 PDF 내장 이미지 형식
+OLLAMA_IMAGE_FORMATS = {"png", "jpeg", "jpg"}
+
+# 작업 상태 저장소 - REDIS_URL을 지정하면 Redis에 저장해 여러 워커가 공유
+REDIS_URL = os.getenv("REDIS_URL")
+
+# uvicorn 워커 수 (WEB_CONCURRENCY) 와 워커별 페이지 파싱 프로세스 수 - 합쳐서 CPU 코어 수를 넘지 않도록 나눔
+# 작업 상태를 공유할 수 없는 기본(메모리) 저장소에서는 워커 1개로 실행
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", str(max(2, os.cpu_count() // 2)) if REDIS_URL else "1"))
+PDF_PAGE_WORKERS = int(os.getenv("PDF_PAGE_WORKERS", str(max(1, os.cpu_count() // WEB_CONCURRENCY))))
+# 프로세스 풀 작업 하나가 처리하는 페이지 수 - 작을수록 취소와 진행률이 빨리 반영되고, 클수록 문서를 여는 횟수가 줄어듦
+PDF_PAGE_CHUNK = int(os.getenv("PDF_PAGE_CHUNK", "4"))
+
+
+# Ollama 비동기 클라이언트 - 이미지 분석을 동시에 요청하되 OLLAMA_NUM_PARALLEL 개수로 제한
+aclient = ollama.AsyncClient()
+# (uvicorn 워커마다 따로 제한하므로 전체 동시 요청 수는 WEB_CONCURRENCY × OLLAMA_NUM_PARALLEL)
+OLLAMA_NUM_PARALLEL = int(os.getenv("OLLAMA_NUM_PARALLEL", "4"))
+ollama_semaphore = asyncio.Semaphore(OLLAMA_NUM_PARALLEL)
+
+# 문서당 분석을 기다리는 이미지 수 상한 - 넘으면 다음 페이지 파싱을 미뤄 이미지 바이트가 메모리에 쌓이지 않게 함
+IMAGE_ANALYSIS_WINDOW = int(os.getenv("IMAGE_ANALYSIS_WINDOW", str(OLLAMA_NUM_PARALLEL * 2)))
+
+# 이 길이(문자 수)를 넘는 문서는 페이지별 요약 후 최종 분석
+MAP_REDUCE_THRESHOLD = int(os.getenv("MAP_REDUCE_THRESHOLD", "8000"))
+PAGE_MARKER = re.compile(r"^--- 페이지 (\d+) ---$", re.MULTILINE)
+
+# /ollama/models 응답 캐시
+OLLAMA_MODELS_TTL = float(os.getenv("OLLAMA_MODELS_TTL", "10"))
+ollama_models_cache: Dict[str, object] = {"time": 0.0, "value": None}
+
+# 이미지 분석 결과 캐시 ((SHA-256, 모델) -> 분석 Task), 오래 사용하지 않은 항목부터 제거
+IMAGE_CACHE_SIZE = int(os.getenv("IMAGE_CACHE_SIZE", "1024"))
+image_cache: "OrderedDict[tuple[str, str], asyncio.Task]" = OrderedDict()
+# 진행 중인 분석 Task별로 결과를 기다리는 요청 수 (모두 취소되면 Ollama 호출도 중단)
+image_waiters: Dict[asyncio.Task, int] = {}
 
 
 class Item(BaseModel):
@@ -58,7 +136,193 @@ class TaskStatus(BaseModel):
     error: Optional[str] = None
 
 
-items_db = []
+TERMINAL_STATUSES = ("completed", "failed", "cancelled")
+
+
+class MemoryTaskStore:
+    # 프로세스 메모리에 작업 상태를 저장 (기본값, 단일 워커용)
+    
+    def __init__(self):
+        self.tasks: Dict[str, Dict] = {}
+        self.subscribers: Dict[str, List[asyncio.Queue]] = {}
+    
+    async def create(self, task: Dict):
+        self.tasks[task["task_id"]] = task
+    
+    async def get(self, task_id: str) -> Optional[Dict]:
+        return self.tasks.get(task_id)
+    
+    async def list(self) -> List[Dict]:
+        return list(self.tasks.values())
+    
+    async def update(self, task_id: str, expected_status: Optional[str] = None, **changes) -> bool:
+        # 값이 실제로 바뀐 경우에만 기록하고 구독자에게 새 상태를 전송
+        # expected_status를 지정하면 현재 상태가 그 값일 때만 기록 (기록하지 않았으면 False)
+        task = self.tasks.get(task_id)
+        if task is None or (expected_status is not None and task["status"] != expected_status):
+            return False
+        
+        changed = {key: value for key, value in changes.items() if task.get(key) != value}
+        if not changed:
+            return True
+        
+        task.update(changed)
+        self._publish(task_id, dict(task))
+        return True
+    
+    async def delete(self, task_id: str):
+        self.tasks.pop(task_id, None)
+        self._publish(task_id, None)
+    
+    def _publish(self, task_id: str, snapshot: Optional[Dict]):
+        for queue in self.subscribers.get(task_id, []):
+            queue.put_nowait(snapshot)
+    
+    async def subscribe(self, task_id: str):
+        # 현재 상태를 먼저 내보내고, 이후에는 상태가 바뀔 때마다 전달 (None은 작업 삭제)
+        queue: asyncio.Queue = asyncio.Queue()
+        self.subscribers.setdefault(task_id, []).append(queue)
+        try:
+            snapshot = self.tasks.get(task_id)
+            while True:
+                yield snapshot
+                snapshot = await queue.get()
+        finally:
+            subscribers = self.subscribers.get(task_id, [])
+            if queue in subscribers:
+                subscribers.remove(queue)
+            if not subscribers:
+                self.subscribers.pop(task_id, None)
+    
+    async def close(self):
+        pass
+
+
+class RedisTaskStore:
+    # Redis 해시(task:{id})에 작업 상태를 저장하고 pub/sub(task:{id}:events)으로 변경 사항을 전달
+    
+    def __init__(self, url: str):
+        self.redis = aioredis.from_url(url, decode_responses=True)
+    
+    @staticmethod
+    def _key(task_id: str) -> str:
+        return f"task:{task_id}"
+    
+    @staticmethod
+    def _channel(task_id: str) -> str:
+        return f"task:{task_id}:events"
+    
+    @staticmethod
+    def _decode(fields: Dict[str, str]) -> Optional[Dict]:
+        return {key: json.loads(value) for key, value in fields.items()} or None
+    
+    async def create(self, task: Dict):
+        await self.redis.hset(self._key(task["task_id"]), mapping={key: json.dumps(value) for key, value in task.items()})
+    
+    async def get(self, task_id: str) -> Optional[Dict]:
+        return self._decode(await self.redis.hgetall(self._key(task_id)))
+    
+    async def list(self) -> List[Dict]:
+        keys = [key async for key in self.redis.scan_iter(match="task:*")]
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.hgetall(key)
+            results = await pipe.execute()
+        return [task for task in map(self._decode, results) if task]
+    
+    async def update(self, task_id: str, expected_status: Optional[str] = None, **changes) -> bool:
+        # 값이 실제로 바뀐 경우에만 기록하고 구독자에게 새 상태를 전송
+        # expected_status를 지정하면 현재 상태가 그 값일 때만 기록 (기록하지 않았으면 False)
+        # WATCH/MULTI로 읽기-비교-쓰기를 원자적으로 처리 - 그 사이 다른 워커가 바꾸면 다시 읽고 재시도
+        key = self._key(task_id)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            while True:
+                try:
+                    await pipe.watch(key)
+                    task = self._decode(await pipe.hgetall(key))
+                    if task is None or (expected_status is not None and task["status"] != expected_status):
+                        return False
+                    
+                    changed = {field: value for field, value in changes.items() if task.get(field) != value}
+                    if not changed:
+                        return True
+                    
+                    task.update(changed)
+                    pipe.multi()
+                    pipe.hset(key, mapping={field: json.dumps(value) for field, value in changed.items()})
+                    pipe.publish(self._channel(task_id), json.dumps(task))
+                    await pipe.execute()
+                    return True
+                except WatchError:
+                    continue
+    
+    async def delete(self, task_id: str):
+        await self.redis.delete(self._key(task_id))
+        await self.redis.publish(self._channel(task_id), json.dumps(None))
+    
+    async def subscribe(self, task_id: str):
+        # 현재 상태를 먼저 내보내고, 이후에는 상태가 바뀔 때마다 전달 (None은 작업 삭제)
+        pubsub = self.redis.pubsub()
+        await pubsub.subscribe(self._channel(task_id))
+        try:
+            yield await self.get(task_id)
+            async for message in pubsub.listen():
+                if message["type"] == "message":
+                    yield json.loads(message["data"])
+        finally:
+            await pubsub.unsubscribe()
+            await pubsub.aclose()
+    
+    async def close(self):
+        await self.redis.aclose()
+
+
+# 진행 중인 작업 추적
+task_store = RedisTaskStore(REDIS_URL) if REDIS_URL else MemoryTaskStore()
+
+
+async def update_task(task_id: str, expected_status: Optional[str] = None, **changes) -> bool:
+    return await task_store.update(task_id, expected_status, **changes)
+
+
+# 이 워커에서 처리 중인 작업의 취소 신호 (저장소에 넣지 않고 프로세스 로컬로 유지)
+cancel_events: Dict[str, asyncio.Event] = {}
+
+
+def raise_if_cancelled(cancel_event: Optional[asyncio.Event]):
+    if cancel_event is not None and cancel_event.is_set():
+        raise asyncio.CancelledError("Task was cancelled")
+
+
+async def until_cancelled(aw, cancel_event: Optional[asyncio.Event]):
+    # aw를 기다리다가 cancel_event가 먼저 설정되면 aw를 취소하고 CancelledError 발생
+    if cancel_event is None:
+        return await aw
+    
+    task = asyncio.ensure_future(aw)
+    waiter = asyncio.ensure_future(cancel_event.wait())
+    try:
+        await asyncio.wait((task, waiter), return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        waiter.cancel()
+        if not task.done():
+            task.cancel()
+            # 취소된 gather 결과를 회수해 "exception was never retrieved" 경고 방지
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+    raise_if_cancelled(cancel_event)
+    return task.result()
+
+
+async def watch_cancellation(task_id: str, cancel_event: asyncio.Event):
+    # 다른 워커에서 받은 취소/삭제 요청을 저장소 구독으로 감지 (REDIS_URL 사용 시)
+    async with aclosing(task_store.subscribe(task_id)) as updates:
+        async for task in updates:
+            if task is None or task["status"] == "cancelled":
+                cancel_event.set()
+                return
+
+
+items_db: Dict[int, dict] = {}
 
 
 @app.get("/")
@@ -68,199 +332,396 @@ async def root():
 
 @app.get("/test", response_class=HTMLResponse)
 async def test_page():
-    with open("static/test.html", "r", encoding="utf-8") as f:
-        return HTMLResponse(content=f.read())
+    return HTMLResponse(content=app.state.html["test"])
 
 
 @app.get("/pdf-test", response_class=HTMLResponse)
 async def pdf_test_page():
-    with open("static/pdf-test.html", "r", encoding="utf-8") as f:
-        return HTMLResponse(content=f.read())
+    return HTMLResponse(content=app.state.html["pdf-test"])
 
 
 @app.get("/api-docs", response_class=HTMLResponse)
 async def api_docs():
-    with open("static/api-docs.html", "r", encoding="utf-8") as f:
-        return HTMLResponse(content=f.read())
+    return HTMLResponse(content=app.state.html["api-docs"])
 
 
 @app.get("/ollama/models")
 async def get_ollama_models():
+    # 모델 목록은 자주 바뀌지 않으므로 OLLAMA_MODELS_TTL초 동안 캐시
+    if ollama_models_cache["value"] and time.monotonic() - ollama_models_cache["time"] < OLLAMA_MODELS_TTL:
+        return ollama_models_cache["value"]
+    
     try:
-        models = ollama.list()
-        return {"models": [model["name"] for model in models["models"]]}
+        models = await aclient.list()
+        value = {"models": [model["name"] for model in models["models"]]}
+        ollama_models_cache.update(time=time.monotonic(), value=value)
+        return value
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get Ollama models: {str(e)}")
 
 
 
 
-async def extract_text_from_pdf_with_pymupdf(pdf_file: UploadFile) -> tuple[str, int]:
+@dataclass
+class LoadedPDF:
+    # 임시 파일로 저장한 업로드 PDF (경로 + 페이지 수)
+    # PyMuPDF 문서 핸들은 프로세스 풀로 넘길 수 없으므로 열어 두지 않고, 각 워커가 경로로 직접 엶
+    path: str
+    page_count: int
+    
+    def close(self):
+        # 파싱이 끝나는 즉시 호출해도 되도록 여러 번 호출해도 안전
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+
+async def _spool(pdf_file: UploadFile) -> str:
+    # 업로드 파일을 1MB 단위로 임시 파일에 저장 (PDF 전체를 메모리에 올리지 않음)
+    tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".pdf")
     try:
-        # PDF 내용을 메모리에서 직접 처리
-        content = await pdf_file.read()
-        pdf_document = fitz.open(stream=content, filetype="pdf")
-        
-        text = ""
-        page_count = pdf_document.page_count
-        
-        # 각 페이지에서 텍스트 추출
-        for page_num in range(page_count):
-            page = pdf_document[page_num]
-            page_text = page.get_text()
-            text += f"--- 페이지 {page_num + 1} ---\n{page_text}\n\n"
-        
-        pdf_document.close()
-        return text.strip(), page_count
-        
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Failed to extract text from PDF: {str(e)}")
+        with tmp:
+            while chunk := await pdf_file.read(1 << 20):
+                tmp.write(chunk)
+    except BaseException:
+        # 읽기/쓰기 도중 실패하면(디스크 부족, 클라이언트 연결 끊김 등) 쓰다 만 파일 삭제
+        os.unlink(tmp.name)
+        raise
+    return tmp.name
+
+
+def _read_page_count(path: str) -> int:
+    with fitz.open(path) as pdf_document:
+        return pdf_document.page_count
 
 
-async def extract_images_from_pdf_and_analyze(pdf_file: UploadFile, model: str = "gemma3:4b", task_id: str = None) -> tuple[str, int]:
+async def load_pdf(pdf_file: UploadFile) -> LoadedPDF:
+    # 임시 파일로 저장한 뒤 페이지 수만 읽고 바로 닫음 (사용 후 close() 필요)
+    path = await _spool(pdf_file)
     try:
-        # PDF 내용을 메모리에서 직접 처리
-        content = await pdf_file.read()
-        all_text = ""
-        
-        # PyMuPDF로 이미지 추출 및 텍스트 추출
-        pdf_document = fitz.open(stream=content, filetype="pdf")
-        page_count = pdf_document.page_count
-        
-        if task_id:
-            processing_tasks[task_id]["current_step"] = f"PDF 문서 로드 완료 ({page_count}페이지)"
-            processing_tasks[task_id]["progress"] = 10
-        
-        # pdfplumber로 텍스트와 테이블 추출
-        with pdfplumber.open(BytesIO(content)) as pdf:
-            for page_num, (fitz_page, plumber_page) in enumerate(zip(pdf_document, pdf.pages), 1):
-                # 취소 확인
-                if task_id and processing_tasks.get(task_id, {}).get("status") == "cancelled":
-                    raise Exception("Task was cancelled")
+        page_count = await asyncio.to_thread(_read_page_count, path)
+    except BaseException:
+        # 열기 실패나 요청 취소 시에도 임시 파일 삭제 (_spool과 동일)
+        os.unlink(path)
+        raise
+    return LoadedPDF(path=path, page_count=page_count)
+
+
+def _extract_pymupdf_sync(pdf_document: fitz.Document) -> tuple[str, int]:
+    parts: list[str] = []
+    page_count = pdf_document.page_count
+    
+    # 각 페이지에서 텍스트 추출
+    for page_num in range(page_count):
+        page = pdf_document[page_num]
+        page_text = page.get_text()
+        parts.append(f"--- 페이지 {page_num + 1} ---\n{page_text}\n\n")
+    
+    return "".join(parts).strip(), page_count
+
+
+async def extract_text_from_pdf_with_pymupdf(pdf: LoadedPDF) -> tuple[str, int]:
+    return await extract_text_from_pdf_with_pymupdf_from_path(pdf.path)
+
+
+async def _iter_pages_in_pool(pdf: LoadedPDF, worker, task_id: str = None):
+    # PDF_PAGE_CHUNK 페이지 묶음을 프로세스 풀에서 실행하고, 끝나는 순서대로 (첫 페이지 번호, 페이지 결과 목록) 전달
+    # 풀에는 워커 수만큼만 제출하고 나머지는 앞 묶음이 끝날 때 제출 - 취소되면 아직 제출하지 않은 페이지는 파싱하지 않음
+    page_count = pdf.page_count
+    chunks = iter([range(start, min(start + PDF_PAGE_CHUNK, page_count)) for start in range(0, page_count, PDF_PAGE_CHUNK)])
+    
+    cancel_event = cancel_events.get(task_id)
+    loop = asyncio.get_running_loop()
+    pool = app.state.pool
+    pending: Dict[asyncio.Future, range] = {}
+    done = 0
+    
+    def submit():
+        chunk = next(chunks, None)
+        if chunk is not None:
+            pending[loop.run_in_executor(pool, worker, pdf.path, chunk)] = chunk
+    
+    try:
+        for _ in range(PDF_PAGE_WORKERS):
+            submit()
+        
+        while pending:
+            finished, _ = await until_cancelled(asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED), cancel_event)
+            for future in finished:
+                chunk = pending.pop(future)
+                pages = future.result()
+                submit()
+                done += len(pages)
                 
                 if task_id:
-                    progress = 10 + (page_num / page_count) * 60  # 10-70% for text extraction
-                    processing_tasks[task_id]["progress"] = int(progress)
-                    processing_tasks[task_id]["current_step"] = f"페이지 {page_num}/{page_count} 텍스트 추출 중"
+                    progress = 10 + (done / page_count) * 60  # 10-70% for text extraction
+                    await update_task(task_id, progress=int(progress), current_step=f"페이지 {done}/{page_count} 텍스트 추출 완료")
                 
-                all_text += f"--- 페이지 {page_num} ---\n"
+                yield chunk.start, pages
+    except BrokenProcessPool:
+        # 워커 프로세스가 죽으면(MuPDF 크래시, OOM 등) 풀을 새로 만들어 이후 요청은 정상 처리 - 현재 요청만 실패
+        if app.state.pool is pool:
+            app.state.pool = new_page_pool()
+            pool.shutdown(wait=False, cancel_futures=True)
+        raise
+    except BaseException:
+        # 제출했지만 아직 시작하지 않은 페이지 묶음은 실행하지 않음
+        for future in pending:
+            future.cancel()
+        raise
+
+
+async def _run_pages_in_pool(pdf: LoadedPDF, worker, task_id: str = None) -> list:
+    # 완료 순서와 무관하게 페이지 순서대로 병합
+    results: Dict[int, list] = {}
+    async with aclosing(_iter_pages_in_pool(pdf, worker, task_id)) as chunks:
+        async for start, pages in chunks:
+            results[start] = pages
+    return [page for start in sorted(results) for page in results[start]]
+
+
+def _process_pages(file_path: str, page_nums: range) -> list[tuple[str, list]]:
+    # 프로세스 풀 워커에서 페이지 묶음을 처리 - 문서는 묶음당 한 번만 엶
+    with fitz.open(file_path) as pdf_document:
+        if PDF_TEXT_ENGINE == "pdfplumber":
+            # pdfplumber 레이아웃이 필요한 경우에만 사용 (PDF_TEXT_ENGINE=pdfplumber)
+            with pdfplumber.open(file_path) as pdf:
+                return [_process_page(pdf_document, pdf.pages[page_num], page_num) for page_num in page_nums]
+        return [_process_page(pdf_document, None, page_num) for page_num in page_nums]
+
+
+def _process_page(pdf_document: fitz.Document, plumber_page, page_num: int) -> tuple[str, list]:
+    # 한 페이지의 (텍스트/테이블 블록, [(img_index, xref, SHA-256, 이미지 바이트 또는 추출 중 발생한 예외)]) 반환
+    # PyMuPDF 한 번의 순회로 텍스트, 테이블, 이미지 추출
+    fitz_page = pdf_document[page_num]
+    
+    if plumber_page is not None:
+        page_text = plumber_page.extract_text()
+        tables = plumber_page.extract_tables()
+    else:
+        page_text = fitz_page.get_text()
+        tables = [table.extract() for table in fitz_page.find_tables().tables]
+    
+    parts: list[str] = [f"--- 페이지 {page_num + 1} ---\n"]
+    
+    if page_text:
+        parts.append(page_text + "\n")
+    
+    # 테이블 추출
+    for table_num, table in enumerate(tables, 1):
+        parts.append(f"\n[표 {table_num}]\n")
+        for row in table:
+            if row:
+                # 셀은 str 또는 None (pdfplumber, PyMuPDF 공통)
+                parts.append(" | ".join(cell or "" for cell in row) + "\n")
+        parts.append("\n")
+    
+    # PyMuPDF로 이미지 추출
+    images = []
+    image_list = fitz_page.get_images()
+    if image_list:
+        parts.append(f"\n[이미지 {len(image_list)}개 분석 결과]\n")
+        
+        for img_index, img in enumerate(image_list):
+            try:
+                xref = img[0]
                 
-                # pdfplumber로 텍스트 추출
-                page_text = plumber_page.extract_text()
-                if page_text:
-                    all_text += page_text + "\n"
+                # PDF에 저장된 원본 이미지 스트림(RGB/그레이스케일 JPEG/PNG)은 재인코딩 없이 그대로 사용
+                # extract_image는 색공간 등 메타데이터만 읽으므로 Pixmap을 만들지 않고 판단 가능
+                info = pdf_document.extract_image(xref) or {}
+                if info.get("colorspace", 3) <= 3 and info.get("ext") in OLLAMA_IMAGE_FORMATS:
+                    img_data = info["image"]
+                else:
+                    # 지원하지 않는 형식(JBIG2, JPX 등)이나 CMYK 이미지만 Pixmap으로 디코딩해 RGB PNG로 변환
+                    pix = fitz.Pixmap(pdf_document, xref)
+                    if pix.n - pix.alpha > 3:
+                        pix = fitz.Pixmap(fitz.csRGB, pix)
+                    img_data = pix.tobytes("png")
+                    pix = None  # 메모리 정리
                 
-                # 테이블 추출
-                tables = plumber_page.extract_tables()
-                for table_num, table in enumerate(tables, 1):
-                    all_text += f"\n[표 {table_num}]\n"
-                    for row in table:
-                        if row:
-                            row_text = " | ".join([str(cell) if cell else "" for cell in row])
-                            all_text += row_text + "\n"
-                    all_text += "\n"
+                # 중복 분석 방지용 SHA-256 계산 (base64 인코딩은 ollama 클라이언트가 요청 시 수행)
+                img_hash = hashlib.sha256(img_data).hexdigest()
+                images.append((img_index, xref, img_hash, img_data))
                 
-                # PyMuPDF로 이미지 추출 및 분석
-                image_list = fitz_page.get_images()
-                if image_list:
-                    all_text += f"\n[이미지 {len(image_list)}개 분석 결과]\n"
-                    
-                    for img_index, img in enumerate(image_list):
-                        # 취소 확인
-                        if task_id and processing_tasks.get(task_id, {}).get("status") == "cancelled":
-                            raise Exception("Task was cancelled")
-                        
-                        if task_id:
-                            img_progress = 70 + ((page_num - 1) / page_count + (img_index + 1) / len(image_list) / page_count) * 20
-                            processing_tasks[task_id]["progress"] = int(img_progress)
-                            processing_tasks[task_id]["current_step"] = f"페이지 {page_num} 이미지 {img_index + 1}/{len(image_list)} 분석 중"
-                        
-                        try:
-                            # 이미지 데이터 추출
-                            xref = img[0]
-                            pix = fitz.Pixmap(pdf_document, xref)
-                            
-                            if pix.n - pix.alpha < 4:  # RGB 또는 그레이스케일
-                                # 이미지를 base64로 인코딩
-                                img_data = pix.tobytes("png")
-                                img_base64 = base64.b64encode(img_data).decode()
-                                
-                                # gemma3:4b 멀티모달로 이미지 분석
-                                image_analysis = await analyze_image_with_ollama(img_base64, model)
-                                all_text += f"이미지 {img_index + 1} 분석:\n{image_analysis}\n\n"
-                            
-                            pix = None  # 메모리 정리
-                            
-                        except Exception as e:
-                            all_text += f"이미지 {img_index + 1}: 분석 실패 - {str(e)}\n"
+            except Exception as e:
+                images.append((img_index, img[0], None, e))
+    
+    return "".join(parts), images
+
+
+async def extract_images_from_pdf_and_analyze(pdf: LoadedPDF, model: str = "gemma3:4b", task_id: str = None) -> tuple[str, int]:
+    cancel_event = cancel_events.get(task_id)
+    analyses: list[asyncio.Task] = []
+    try:
+        page_count = pdf.page_count
+        if task_id:
+            await update_task(task_id, progress=10, current_step=f"PDF 문서 로드 완료 ({page_count}페이지)")
+        
+        # 같은 xref(여러 페이지에 배치된 동일 이미지 객체)는 문서 전체에서 한 번만 분석
+        seen: dict[int, int] = {}
+        in_flight: set[asyncio.Task] = set()
+        # 첫 페이지 번호 -> [(텍스트/테이블 블록, [(img_index, analyses 인덱스 또는 추출 중 발생한 예외)])]
+        pages: dict[int, list] = {}
+        
+        # 페이지 파싱은 프로세스 풀에서 병렬 실행 - 묶음이 끝나는 대로 이미지 분석을 시작하고 이미지 바이트는 분석 Task만 보유
+        async with aclosing(_iter_pages_in_pool(pdf, _process_pages, task_id)) as chunks:
+            async for start, chunk_pages in chunks:
+                pages[start] = []
+                for page_text_block, images in chunk_pages:
+                    refs = []
+                    for img_index, xref, img_hash, data in images:
+                        if isinstance(data, bytes):
+                            if xref not in seen:
+                                seen[xref] = len(analyses)
+                                task = asyncio.ensure_future(analyze_image_with_ollama(data, model, img_hash))
+                                analyses.append(task)
+                                in_flight.add(task)
+                                task.add_done_callback(in_flight.discard)
+                            data = seen[xref]
+                        refs.append((img_index, data))
+                    pages[start].append((page_text_block, refs))
+                del chunk_pages
                 
-                all_text += "\n"
+                # 분석을 기다리는 이미지가 많으면 다음 묶음을 받기 전에 일부가 끝날 때까지 대기
+                while len(in_flight) >= IMAGE_ANALYSIS_WINDOW:
+                    await until_cancelled(asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED), cancel_event)
+        
+        # 파싱이 끝났으므로 Ollama 분석을 기다리지 않고 임시 파일 삭제
+        pdf.close()
         
-        pdf_document.close()
+        if task_id:
+            await update_task(task_id, progress=70, current_step=f"이미지 {len(analyses)}개 분석 중")
+        
+        # 남은 이미지 분석(gemma3:4b 멀티모달, 동시 실행)을 기다리며 하나 끝날 때마다 진행률 갱신
+        total = len(analyses)
+        remaining = list(in_flight)
+        done = total - len(remaining)
+        for finished in asyncio.as_completed(remaining):
+            await until_cancelled(finished, cancel_event)
+            done += 1
+            if task_id:
+                progress = 70 + (done / total) * 20  # 70-90% for image analysis
+                await update_task(task_id, progress=int(progress), current_step=f"이미지 {done}/{total} 분석 완료")
+        
+        parts: list[str] = []
+        for start in sorted(pages):
+            for page_text_block, images in pages[start]:
+                parts.append(page_text_block)
+                for img_index, ref in images:
+                    result = ref if isinstance(ref, Exception) else analyses[ref].result()
+                    if isinstance(result, Exception):
+                        parts.append(f"이미지 {img_index + 1}: 분석 실패 - {str(result)}\n")
+                    else:
+                        parts.append(f"이미지 {img_index + 1} 분석:\n{result}\n\n")
+                
+                parts.append("\n")
         
         if task_id:
-            processing_tasks[task_id]["current_step"] = "PDF 분석 완료"
-            processing_tasks[task_id]["progress"] = 90
+            await update_task(task_id, progress=90, current_step="PDF 분석 완료")
         
-        return all_text.strip(), page_count
+        return "".join(parts).strip(), page_count
         
     except Exception as e:
-        if "cancelled" in str(e):
-            raise e
+        # 취소(asyncio.CancelledError)는 Exception이 아니므로 그대로 전달됨
         raise HTTPException(status_code=400, detail=f"Failed to extract and analyze PDF: {str(e)}")
+    finally:
+        # 취소되거나 실패하면 남은 이미지 분석도 중단해 Ollama 세마포어 슬롯을 반환
+        for task in analyses:
+            task.cancel()
 
 
-async def analyze_image_with_ollama(image_base64: str, model: str) -> str:
-    try:
-        # gemma3:4b 멀티모달로 이미지 분석
-        response = ollama.generate(
+async def _generate_image_analysis(image_data: bytes, model: str) -> str:
+    # gemma3:4b 멀티모달로 이미지 분석
+    async with ollama_semaphore:
+        response = await aclient.generate(
             model=model,
             prompt="이 이미지에 있는 모든 텍스트를 추출하고, 이미지의 내용을 상세히 설명해주세요. 텍스트가 있다면 정확히 추출해주세요.",
-            images=[image_base64]
+            images=[image_data]
         )
-        return response["response"]
+    return response["response"]
+
+
+async def analyze_image_with_ollama(image_data: bytes, model: str, image_hash: Optional[str] = None) -> str:
+    if image_hash is None:
+        try:
+            return await _generate_image_analysis(image_data, model)
+        except Exception as e:
+            return f"이미지 분석 실패: {str(e)}"
+    
+    # 같은 이미지(SHA-256)와 모델 조합은 한 번만 분석하고, 동시에 들어온 중복 요청도 같은 Task를 기다림
+    key = (image_hash, model)
+    task = image_cache.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_generate_image_analysis(image_data, model))
+        image_cache[key] = task
+        if len(image_cache) > IMAGE_CACHE_SIZE:
+            image_cache.popitem(last=False)
+    else:
+        image_cache.move_to_end(key)
+    
+    image_waiters[task] = image_waiters.get(task, 0) + 1
+    try:
+        return await asyncio.shield(task)
+    except asyncio.CancelledError:
+        # 마지막으로 기다리던 요청이 취소되면 Ollama 호출을 중단해 세마포어 슬롯을 반환
+        if image_waiters[task] == 1 and not task.done():
+            task.cancel()
+            if image_cache.get(key) is task:
+                del image_cache[key]
+        raise
     except Exception as e:
+        # 실패한 결과는 캐시하지 않음
+        if image_cache.get(key) is task:
+            del image_cache[key]
         return f"이미지 분석 실패: {str(e)}"
+    finally:
+        image_waiters[task] -= 1
+        if not image_waiters[task]:
+            del image_waiters[task]
+
+
+def _process_plumber_pages(file_path: str, page_nums: range) -> list[str]:
+    # 프로세스 풀 워커에서 페이지 묶음을 처리 - 문서는 묶음당 한 번만 엶
+    with pdfplumber.open(file_path) as pdf:
+        return [_process_plumber_page(pdf.pages[page_num], page_num) for page_num in page_nums]
 
 
-async def extract_text_from_pdf_with_pdfplumber(pdf_file: UploadFile) -> tuple[str, int]:
+def _process_plumber_page(page, page_num: int) -> str:
+    parts: list[str] = [f"--- 페이지 {page_num + 1} ---\n"]
+    
+    # 텍스트 추출
+    page_text = page.extract_text()
+    if page_text:
+        parts.append(page_text + "\n")
+    
+    # 테이블 추출
+    tables = page.extract_tables()
+    for table_num, table in enumerate(tables, 1):
+        parts.append(f"\n[표 {table_num}]\n")
+        for row in table:
+            if row:  # None이 아닌 행만 처리
+                # 셀은 str 또는 None (pdfplumber, PyMuPDF 공통)
+                parts.append(" | ".join(cell or "" for cell in row) + "\n")
+        parts.append("\n")
+    
+    # 이미지 정보 추출
+    images = page.images
+    if images:
+        parts.append(f"\n[이미지 {len(images)}개 발견]\n")
+        for img_num, img in enumerate(images, 1):
+            bbox = img.get('bbox', [0, 0, 0, 0])
+            parts.append(f"이미지 {img_num}: 위치 x={bbox[0]:.1f}, y={bbox[1]:.1f}, 크기 {bbox[2]-bbox[0]:.1f}x{bbox[3]-bbox[1]:.1f}\n")
+    
+    parts.append("\n")
+    return "".join(parts)
+
+
+async def extract_text_from_pdf_with_pdfplumber(pdf: LoadedPDF) -> tuple[str, int]:
     try:
-        # PDF 내용을 메모리에서 직접 처리
-        content = await pdf_file.read()
-        
-        with pdfplumber.open(BytesIO(content)) as pdf:
-            text = ""
-            page_count = len(pdf.pages)
-            
-            for page_num, page in enumerate(pdf.pages, 1):
-                text += f"--- 페이지 {page_num} ---\n"
-                
-                # 텍스트 추출
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-                
-                # 테이블 추출
-                tables = page.extract_tables()
-                for table_num, table in enumerate(tables, 1):
-                    text += f"\n[표 {table_num}]\n"
-                    for row in table:
-                        if row:  # None이 아닌 행만 처리
-                            row_text = " | ".join([str(cell) if cell else "" for cell in row])
-                            text += row_text + "\n"
-                    text += "\n"
-                
-                # 이미지 정보 추출
-                images = page.images
-                if images:
-                    text += f"\n[이미지 {len(images)}개 발견]\n"
-                    for img_num, img in enumerate(images, 1):
-                        bbox = img.get('bbox', [0, 0, 0, 0])
-                        text += f"이미지 {img_num}: 위치 x={bbox[0]:.1f}, y={bbox[1]:.1f}, 크기 {bbox[2]-bbox[0]:.1f}x{bbox[3]-bbox[1]:.1f}\n"
-                
-                text += "\n"
-            
-            return text.strip(), page_count
+        # 페이지 파싱은 프로세스 풀에서 병렬 실행
+        pages = await _run_pages_in_pool(pdf, _process_plumber_pages)
+        return "".join(pages).strip(), pdf.page_count
         
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Failed to extract text from PDF with pdfplumber: {str(e)}")
@@ -268,32 +729,53 @@ async def extract_text_from_pdf_with_pdfplumber(pdf_file: UploadFile) -> tuple[s
 
 async def extract_text_from_pdf_with_pymupdf_from_path(file_path: str) -> tuple[str, int]:
     try:
-        pdf_document = fitz.open(file_path)
-        
-        text = ""
-        page_count = pdf_document.page_count
-        
-        # 각 페이지에서 텍스트 추출
-        for page_num in range(page_count):
-            page = pdf_document[page_num]
-            page_text = page.get_text()
-            text += f"--- 페이지 {page_num + 1} ---\n{page_text}\n\n"
-        
-        pdf_document.close()
-        return text.strip(), page_count
+        pdf_document = await asyncio.to_thread(fitz.open, file_path)
+        try:
+            return await asyncio.to_thread(_extract_pymupdf_sync, pdf_document)
+        finally:
+            pdf_document.close()
         
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Failed to extract text from PDF: {str(e)}")
 
 
+async def _summarize_page(page_num: str, page_text: str, model_name: str) -> str:
+    async with ollama_semaphore:
+        response = await aclient.generate(
+            model=model_name,
+            prompt=f"""다음은 PDF 문서의 {page_num}페이지 내용입니다. 핵심 내용과 중요한 정보를 한국어로 간결하게 요약해주세요:
+
+{page_text}"""
+        )
+    return f"--- 페이지 {page_num} 요약 ---\n{response['response']}"
+
+
+async def _summarize_pages(text: str, model_name: str) -> str:
+    # "--- 페이지 N ---" 구분자로 나눈 페이지들을 동시에 요약 (map 단계)
+    chunks = PAGE_MARKER.split(text)
+    pages = [(chunks[i], chunks[i + 1].strip()) for i in range(1, len(chunks) - 1, 2)]
+    if not pages:
+        return text
+    
+    summaries = await asyncio.gather(
+        *[_summarize_page(page_num, page_text, model_name) for page_num, page_text in pages if page_text]
+    )
+    return "\n\n".join(summaries)
+
+
 async def analyze_text_with_ollama(text: str, model_name: str, prompt: str = None) -> str:
     try:
         if not prompt:
+            # 긴 문서는 페이지별 요약을 먼저 만든 뒤 요약들을 모아 최종 분석 (map-reduce)
+            if len(text) > MAP_REDUCE_THRESHOLD:
+                text = await _summarize_pages(text, model_name)
+            
             prompt = f"""다음 텍스트를 분석하고 요약해주세요. 주요 내용, 핵심 포인트, 그리고 중요한 정보들을 한국어로 정리해주세요:
 
 {text}"""
         
-        response = ollama.generate(model=model_name, prompt=prompt)
+        async with ollama_semaphore:
+            response = await aclient.generate(model=model_name, prompt=prompt)
         return response["response"]
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to analyze text with Ollama: {str(e)}")
@@ -312,8 +794,12 @@ async def analyze_pdf(
         if not file.filename.lower().endswith('.pdf'):
             raise HTTPException(status_code=400, detail="Only PDF files are allowed")
         
-        # 완전한 PDF 분석 (pdfplumber + PyMuPDF + gemma3:4b 멀티모달)
-        text_content, page_count = await extract_images_from_pdf_and_analyze(file, model)
+        # 완전한 PDF 분석 (PyMuPDF + gemma3:4b 멀티모달)
+        pdf = await load_pdf(file)
+        try:
+            text_content, page_count = await extract_images_from_pdf_and_analyze(pdf, model)
+        finally:
+            pdf.close()
         
         if not text_content.strip():
             raise HTTPException(status_code=400, detail="No text could be extracted from the PDF")
@@ -348,7 +834,7 @@ async def analyze_pdf_async(
         task_id = str(uuid.uuid4())
         
         # 태스크 상태 초기화
-        processing_tasks[task_id] = {
+        await task_store.create({
             "task_id": task_id,
             "status": "processing",
             "progress": 0,
@@ -357,7 +843,8 @@ async def analyze_pdf_async(
             "error": None,
             "filename": file.filename,
             "model": model
-        }
+        })
+        cancel_events[task_id] = asyncio.Event()
         
         # 백그라운드에서 PDF 분석 실행
         background_tasks.add_task(process_pdf_async, task_id, file, model, custom_prompt)
@@ -369,19 +856,22 @@ async def analyze_pdf_async(
 
 
 async def process_pdf_async(task_id: str, file: UploadFile, model: str, custom_prompt: Optional[str]):
+    cancel_event = cancel_events.setdefault(task_id, asyncio.Event())
+    # 다른 워커로 들어온 취소 요청은 저장소를 구독해 감지
+    watcher = asyncio.create_task(watch_cancellation(task_id, cancel_event)) if REDIS_URL else None
     try:
         # PDF 분석 실행
-        text_content, page_count = await extract_images_from_pdf_and_analyze(file, model, task_id)
+        pdf = await load_pdf(file)
+        try:
+            raise_if_cancelled(cancel_event)
+            text_content, page_count = await extract_images_from_pdf_and_analyze(pdf, model, task_id)
+        finally:
+            pdf.close()
         
-        # 취소 확인
-        if processing_tasks.get(task_id, {}).get("status") == "cancelled":
-            return
-        
-        processing_tasks[task_id]["current_step"] = "AI 분석 중"
-        processing_tasks[task_id]["progress"] = 90
+        await update_task(task_id, progress=90, current_step="AI 분석 중")
         
         # 최종 AI 분석
-        analysis = await analyze_text_with_ollama(text_content, model, custom_prompt)
+        analysis = await until_cancelled(analyze_text_with_ollama(text_content, model, custom_prompt), cancel_event)
         
         # 결과 저장
         result = PDFAnalysisResponse(
@@ -393,99 +883,141 @@ async def process_pdf_async(task_id: str, file: UploadFile, model: str, custom_p
             task_id=task_id
         )
         
-        processing_tasks[task_id].update({
-            "status": "completed",
-            "progress": 100,
-            "current_step": "분석 완료",
-            "result": result
-        })
+        # 분석 중 취소된 작업을 completed로 덮어쓰지 않도록 마지막으로 확인
+        # (다른 워커의 취소가 그 사이에 기록될 수 있으므로 처리 중일 때만 기록)
+        raise_if_cancelled(cancel_event)
+        await update_task(
+            task_id,
+            expected_status="processing",
+            status="completed",
+            progress=100,
+            current_step="분석 완료",
+            result=result.model_dump()
+        )
         
+    except asyncio.CancelledError:
+        # 사용자 취소는 cancel 엔드포인트가 이미 상태를 기록함 - 서버 종료 등 다른 취소는 그대로 전달
+        if not cancel_event.is_set():
+            raise
     except Exception as e:
-        processing_tasks[task_id].update({
-            "status": "failed",
-            "progress": 0,
-            "current_step": "분석 실패",
-            "error": str(e)
-        })
+        await update_task(
+            task_id,
+            expected_status="processing",
+            status="failed",
+            progress=0,
+            current_step="분석 실패",
+            error=str(e)
+        )
+    finally:
+        if watcher is not None:
+            watcher.cancel()
+        cancel_events.pop(task_id, None)
 
 
 @app.get("/tasks/{task_id}/status", response_model=TaskStatus)
 async def get_task_status(task_id: str):
-    if task_id not in processing_tasks:
+    task = await task_store.get(task_id)
+    if task is None:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    return TaskStatus(**processing_tasks[task_id])
+    return TaskStatus(**task)
+
+
+@app.get("/tasks/{task_id}/events")
+async def stream_task_events(task_id: str):
+    if await task_store.get(task_id) is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    
+    async def event_stream():
+        # 현재 상태를 먼저 보내고, 이후에는 상태가 바뀔 때만 전송 (None은 작업 삭제)
+        async with aclosing(task_store.subscribe(task_id)) as updates:
+            async for task in updates:
+                if task is None:
+                    break
+                snapshot = TaskStatus(**task)
+                yield f"data: {snapshot.model_dump_json()}\n\n"
+                if snapshot.status in TERMINAL_STATUSES:
+                    break
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
 
 
 @app.post("/tasks/{task_id}/cancel")
 async def cancel_task(task_id: str):
-    if task_id not in processing_tasks:
+    task = await task_store.get(task_id)
+    if task is None:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    if processing_tasks[task_id]["status"] in ["completed", "failed", "cancelled"]:
+    if task["status"] in TERMINAL_STATUSES:
         raise HTTPException(status_code=400, detail="Task cannot be cancelled")
     
-    processing_tasks[task_id]["status"] = "cancelled"
-    processing_tasks[task_id]["current_step"] = "사용자에 의해 취소됨"
+    # 확인 후 다른 워커가 완료로 바꿨을 수 있으므로 처리 중일 때만 취소로 기록
+    if not await update_task(task_id, expected_status="processing", status="cancelled", current_step="사용자에 의해 취소됨"):
+        raise HTTPException(status_code=400, detail="Task cannot be cancelled")
+    # 이 워커에서 처리 중이면 바로 중단 (다른 워커는 저장소 구독으로 감지)
+    if task_id in cancel_events:
+        cancel_events[task_id].set()
     
     return {"message": "Task cancelled successfully"}
 
 
 @app.get("/tasks")
 async def get_all_tasks():
-    return {"tasks": list(processing_tasks.values())}
+    return {"tasks": await task_store.list()}
 
 
 @app.delete("/tasks/{task_id}")
 async def delete_task(task_id: str):
-    if task_id not in processing_tasks:
+    if await task_store.get(task_id) is None:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    del processing_tasks[task_id]
+    await task_store.delete(task_id)
+    # 처리 중인 작업이 삭제되면 분석도 중단
+    if task_id in cancel_events:
+        cancel_events[task_id].set()
     return {"message": "Task deleted successfully"}
 
 
 @app.get("/items", response_model=List[Item])
 async def get_items():
-    return items_db
+    return list(items_db.values())
 
 
 @app.get("/items/{item_id}", response_model=Item)
 async def get_item(item_id: int):
-    for item in items_db:
-        if item["id"] == item_id:
-            return item
-    return {"error": "Item not found"}
+    if item_id not in items_db:
+        raise HTTPException(status_code=404, detail="Item not found")
+    return items_db[item_id]
 
 
 @app.post("/items", response_model=Item)
 async def create_item(item: Item):
     item_dict = item.dict()
-    item_dict["id"] = len(items_db) + 1
-    items_db.append(item_dict)
+    # 삭제 후에도 ID가 겹치지 않도록 현재 최대 ID + 1 사용
+    item_dict["id"] = (max(items_db) if items_db else 0) + 1
+    items_db[item_dict["id"]] = item_dict
     return item_dict
 
 
 @app.put("/items/{item_id}", response_model=Item)
 async def update_item(item_id: int, item: Item):
-    for i, existing_item in enumerate(items_db):
-        if existing_item["id"] == item_id:
-            item_dict = item.dict()
-            item_dict["id"] = item_id
-            items_db[i] = item_dict
-            return item_dict
-    return {"error": "Item not found"}
+    if item_id not in items_db:
+        raise HTTPException(status_code=404, detail="Item not found")
+    item_dict = item.dict()
+    item_dict["id"] = item_id
+    items_db[item_id] = item_dict
+    return item_dict
 
 
 @app.delete("/items/{item_id}")
 async def delete_item(item_id: int):
-    for i, item in enumerate(items_db):
-        if item["id"] == item_id:
-            deleted_item = items_db.pop(i)
-            return {"message": f"Item {item_id} deleted", "item": deleted_item}
-    return {"error": "Item not found"}
+    deleted_item = items_db.pop(item_id, None)
+    if deleted_item is None:
+        raise HTTPException(status_code=404, detail="Item not found")
+    return {"message": f"Item {item_id} deleted", "item": deleted_item}
 
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    # 여러 워커로 실행하려면 REDIS_URL 지정 (작업 상태를 워커 간에 공유)
+    uvicorn.run("main:app", host="0.0.0.0", port=8000, workers=WEB_CONCURRENCY)
\ No newline at end of file